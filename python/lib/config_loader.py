@@ -1,10 +1,14 @@
 """Configuration loading and AWS session utilities."""
 from __future__ import annotations
 
+import copy
+import functools
 import os
+import threading
 from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
 
 import boto3
 import yaml
@@ -12,6 +16,11 @@ from botocore.credentials import ReadOnlyCredentials
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, ValidationError
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 class AWSConfig(BaseModel):
     profile: Optional[str] = Field(default=None, description="AWS profile name")
@@ -47,73 +56,160 @@ class AppConfig(BaseModel):
 DEFAULT_CONFIG_PATH = Path("common/config/config.yml")
 DEFAULT_ENV_PATH = Path(".env")
 
-
-def _ensure_nested(data: Dict[str, Any], key: str) -> Dict[str, Any]:
-    if key not in data or not isinstance(data[key], dict):
-        data[key] = {}
-    return data[key]
-
-
-def _apply_env_overrides(data: Dict[str, Any]) -> Dict[str, Any]:
-    aws = _ensure_nested(data, "aws")
-    glacier = _ensure_nested(data, "glacier")
-    delete_cfg = _ensure_nested(data, "delete")
-    logging_cfg = _ensure_nested(data, "logging")
+_ENV_KEYS = (
+    "AWS_PROFILE",
+    "AWS_ROLE_ARN",
+    "AWS_REGION",
+    "GLACIER_VAULTS",
+    "GLACIER_RETENTION_DAYS",
+    "GLACIER_INVENTORY_FILE",
+    "GLACIER_DRY_RUN",
+    "LOG_LEVEL",
+)
+
+_GETENV = os.environ.get
+
+# Latest parsed YAML per path, tagged with its (path, mtime_ns, size) key; older versions
+# are replaced rather than kept. Callers always receive a deep copy.
+_YAML_CACHE: Dict[str, Tuple[Tuple[str, int, int], Dict[str, Any]]] = {}
+
+# Base sessions keyed by (profile, region); they refresh their own credentials.
+_SESSION_CACHE: Dict[Tuple[Optional[str], str], boto3.Session] = {}
+# Assumed-role sessions keyed by (base profile, base access key, role_arn, region), with
+# the expiry of their STS credentials.
+_ROLE_SESSION_CACHE: Dict[
+    Tuple[str, Optional[str], str, str], Tuple[datetime, boto3.Session]
+] = {}
+_SESSION_LOCK = threading.Lock()
+_CREDENTIAL_REFRESH_MARGIN = timedelta(minutes=5)
+
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
+
+
+def _section(data: Dict[str, Any], key: str) -> Dict[str, Any]:
+    value = data.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+def _clone(model: _ModelT) -> _ModelT:
+    """Copy a validated model via ``model_construct``, preserving ``model_fields_set``."""
+    fields: Dict[str, Any] = {}
+    for name in type(model).model_fields:
+        value = getattr(model, name)
+        if isinstance(value, BaseModel):
+            value = _clone(value)
+        elif isinstance(value, list):
+            value = [_clone(item) if isinstance(item, BaseModel) else item for item in value]
+        fields[name] = value
+    return type(model).model_construct(_fields_set=set(model.model_fields_set), **fields)
+
+
+@functools.cache
+def _load_dotenv_once(env_path: Path, mtime_ns: int) -> None:
+    # Keyed on mtime so keys added to .env are picked up on the next load_config call;
+    # with override=False, values already in os.environ (including ones an earlier load
+    # set from this file) are never replaced, so edits to existing keys are not seen.
+    load_dotenv(env_path, override=False)
+
+
+def _yaml_cache_key(config_path: Path) -> Tuple[str, int, int]:
+    st = config_path.stat()
+    return (str(config_path), st.st_mtime_ns, st.st_size)
+
+
+def _read_yaml(config_path: Path, key: Tuple[str, int, int]) -> Dict[str, Any]:
+    entry = _YAML_CACHE.get(key[0])
+    if entry is not None and entry[0] == key:
+        cached = entry[1]
+    else:
+        with config_path.open("r", encoding="utf-8") as f:
+            cached = yaml.load(f, Loader=_YamlLoader) or {}
+        if not isinstance(cached, dict):
+            raise ValueError("Config YAML must define a mapping at the root")
+        _YAML_CACHE[key[0]] = (key, cached)
+    return copy.deepcopy(cached)
+
+
+def _apply_env_overrides(yaml_data: Dict[str, Any]) -> Dict[str, Any]:
+    aws = _section(yaml_data, "aws")
+    glacier = _section(yaml_data, "glacier")
+    delete_cfg = _section(yaml_data, "delete")
+    logging_cfg = _section(yaml_data, "logging")
+    data = {
+        **yaml_data,
+        "aws": aws,
+        "glacier": glacier,
+        "delete": delete_cfg,
+        "logging": logging_cfg,
+    }
+    # The sections are shared with ``data``, so the overrides below land in it directly.
+    if not any(key in os.environ for key in _ENV_KEYS):
+        return data
 
     # AWS
-    if os.getenv("AWS_PROFILE"):
-        aws["profile"] = os.getenv("AWS_PROFILE")
-    if os.getenv("AWS_ROLE_ARN"):
-        aws["role_arn"] = os.getenv("AWS_ROLE_ARN")
-    if os.getenv("AWS_REGION"):
-        aws["region"] = os.getenv("AWS_REGION")
+    profile = _GETENV("AWS_PROFILE")
+    if profile:
+        aws["profile"] = profile
+    role_arn = _GETENV("AWS_ROLE_ARN")
+    if role_arn:
+        aws["role_arn"] = role_arn
+    region = _GETENV("AWS_REGION")
+    if region:
+        aws["region"] = region
 
     # Glacier vault overrides
-    vaults_env = os.getenv("GLACIER_VAULTS")
-    retention_env = os.getenv("GLACIER_RETENTION_DAYS")
+    vaults_env = _GETENV("GLACIER_VAULTS")
+    retention_env = _GETENV("GLACIER_RETENTION_DAYS")
+    retention_days: Optional[int] = None
+    if retention_env:
+        try:
+            retention_days = int(retention_env)
+        except ValueError:
+            raise ValueError(
+                f"GLACIER_RETENTION_DAYS must be an integer, got {retention_env!r}"
+            ) from None
+        if retention_days < 1:
+            raise ValueError(
+                f"GLACIER_RETENTION_DAYS must be a positive integer, got {retention_env!r}"
+            )
     if vaults_env:
-        names = [v.strip() for v in vaults_env.split(",") if v.strip()]
-        retention_val = int(retention_env) if retention_env else None
+        default_retention = retention_days if retention_days is not None else 365
+        # Names are stripped and non-empty and retention is checked above, so build the
+        # models directly; pydantic accepts model instances without revalidating them.
         glacier["vaults"] = [
-            {"name": name, "retention_days": retention_val or 365}
-            for name in names
+            VaultConfig.model_construct(name=name, retention_days=default_retention)
+            for name in filter(None, map(str.strip, vaults_env.split(",")))
         ]
-    elif retention_env:
-        # apply retention to existing vaults
-        try:
-            retention_val = int(retention_env)
-            if "vaults" in glacier and isinstance(glacier["vaults"], list):
-                glacier["vaults"] = [
-                    {**v, "retention_days": retention_val} for v in glacier["vaults"]
-                ]
-        except ValueError:
-            raise ValueError("GLACIER_RETENTION_DAYS must be an integer")
+    elif retention_days is not None:
+        # apply retention to existing vaults; yaml_data is a private copy, so mutate in place
+        if isinstance(glacier.get("vaults"), list):
+            for v in glacier["vaults"]:
+                v["retention_days"] = retention_days
 
-    if os.getenv("GLACIER_INVENTORY_FILE"):
-        glacier["inventory_file"] = os.getenv("GLACIER_INVENTORY_FILE")
+    inventory_file = _GETENV("GLACIER_INVENTORY_FILE")
+    if inventory_file:
+        glacier["inventory_file"] = inventory_file
 
-    if os.getenv("GLACIER_DRY_RUN"):
-        delete_cfg["dry_run"] = os.getenv("GLACIER_DRY_RUN").lower() != "false"
+    dry_run = _GETENV("GLACIER_DRY_RUN")
+    if dry_run:
+        delete_cfg["dry_run"] = dry_run.lower() != "false"
 
-    if os.getenv("LOG_LEVEL"):
-        logging_cfg["level"] = os.getenv("LOG_LEVEL")
+    log_level = _GETENV("LOG_LEVEL")
+    if log_level:
+        logging_cfg["level"] = log_level
 
     return data
 
 
-def load_config(config_path: Path = DEFAULT_CONFIG_PATH) -> AppConfig:
-    """Load config from YAML, overlay .env/env vars, and validate."""
-    load_dotenv(DEFAULT_ENV_PATH, override=False)
-
-    data: Dict[str, Any] = {}
-    if config_path.exists():
-        with config_path.open("r", encoding="utf-8") as f:
-            yaml_data = yaml.safe_load(f) or {}
-            if not isinstance(yaml_data, dict):
-                raise ValueError("Config YAML must define a mapping at the root")
-            data.update(yaml_data)
-
-    data = _apply_env_overrides(data)
+@functools.lru_cache(maxsize=4)
+def _load_validated(
+    config_path: Path,
+    yaml_key: Optional[Tuple[str, int, int]],
+    env_fingerprint: Tuple[Optional[str], ...],
+) -> AppConfig:
+    # env_fingerprint is only part of the cache key; the overrides read os.environ directly.
+    yaml_data = _read_yaml(config_path, yaml_key) if yaml_key is not None else {}
+    data = _apply_env_overrides(yaml_data)
 
     try:
         return AppConfig.model_validate(data)
@@ -121,24 +217,59 @@ def load_config(config_path: Path = DEFAULT_CONFIG_PATH) -> AppConfig:
         raise ValueError(f"Invalid configuration: {exc}") from exc
 
 
+def load_config(config_path: Path = DEFAULT_CONFIG_PATH) -> AppConfig:
+    """Load config from YAML, overlay .env/env vars, and validate.
+
+    The validated config is memoized on the YAML file's (path, mtime, size) and the relevant
+    env vars; each call returns a fresh copy of it built via ``model_construct``.
+    """
+    if DEFAULT_ENV_PATH.exists():
+        _load_dotenv_once(DEFAULT_ENV_PATH, DEFAULT_ENV_PATH.stat().st_mtime_ns)
+
+    yaml_key = _yaml_cache_key(config_path) if config_path.exists() else None
+    env_fingerprint = tuple(_GETENV(k) for k in _ENV_KEYS)
+    return _clone(_load_validated(config_path, yaml_key, env_fingerprint))
+
+
 def assume_role_session(base_session: boto3.Session, role_arn: str, region: str) -> boto3.Session:
-    sts = base_session.client("sts", region_name=region)
-    resp = sts.assume_role(RoleArn=role_arn, RoleSessionName="glacier-prune")
-    creds = resp["Credentials"]
-    return boto3.Session(
-        aws_access_key_id=creds["AccessKeyId"],
-        aws_secret_access_key=creds["SecretAccessKey"],
-        aws_session_token=creds["SessionToken"],
-        region_name=region,
+    base_creds = base_session.get_credentials()
+    key = (
+        base_session.profile_name,
+        base_creds.access_key if base_creds is not None else None,
+        role_arn,
+        region,
     )
+    with _SESSION_LOCK:
+        cached = _ROLE_SESSION_CACHE.get(key)
+        if cached is not None:
+            expiration, session = cached
+            if datetime.now(timezone.utc) + _CREDENTIAL_REFRESH_MARGIN < expiration:
+                return session
+
+        sts = base_session.client("sts", region_name=region)
+        resp = sts.assume_role(RoleArn=role_arn, RoleSessionName="glacier-prune")
+        creds = resp["Credentials"]
+        session = boto3.Session(
+            aws_access_key_id=creds["AccessKeyId"],
+            aws_secret_access_key=creds["SecretAccessKey"],
+            aws_session_token=creds["SessionToken"],
+            region_name=region,
+        )
+        _ROLE_SESSION_CACHE[key] = (creds["Expiration"], session)
+        return session
 
 
 def build_boto3_session(cfg: AWSConfig) -> boto3.Session:
-    base = (
-        boto3.Session(profile_name=cfg.profile, region_name=cfg.region)
-        if cfg.profile
-        else boto3.Session(region_name=cfg.region)
-    )
+    key = (cfg.profile, cfg.region)
+    with _SESSION_LOCK:
+        base = _SESSION_CACHE.get(key)
+        if base is None:
+            base = (
+                boto3.Session(profile_name=cfg.profile, region_name=cfg.region)
+                if cfg.profile
+                else boto3.Session(region_name=cfg.region)
+            )
+            _SESSION_CACHE[key] = base
     if cfg.role_arn:
         return assume_role_session(base, cfg.role_arn, cfg.region)
     return base
@@ -5,13 +5,21 @@ reads the inventory, and deletes every archive listed. Be aware that
 inventory retrieval can take hours.
 """
 import argparse
-import json
 import logging
+import mmap
+import os
+import shutil
 import sys
 import time
-from typing import Dict, List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import BinaryIO, Iterator, List, Optional
 
 import boto3
+import ijson
+import orjson
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
 
 
 def parse_args() -> argparse.Namespace:
@@ -44,12 +52,20 @@ def parse_args() -> argparse.Namespace:
         "--use-job-id",
         help="Use an existing inventory-retrieval job ID instead of starting a new one",
     )
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=32,
+        help="Number of concurrent delete requests (default: 32)",
+    )
     
     args = parser.parse_args()
     
     # Validate mutually exclusive options
     if args.load_inventory and args.use_job_id:
         parser.error("--load-inventory and --use-job-id are mutually exclusive")
+    if args.parallelism < 1:
+        parser.error("--parallelism must be at least 1")
     
     return args
 
@@ -63,14 +79,16 @@ def start_inventory_job(client, vault_name: str) -> str:
 
 
 def wait_for_job(client, vault_name: str, job_id: str, poll_seconds: int) -> None:
-    logging.info("Waiting for inventory job %s to complete (this can take hours)...", job_id)
+    logger.info("Waiting for inventory job %s to complete (this can take hours)...", job_id)
     poll_count = 0
     while True:
         job = client.describe_job(vaultName=vault_name, jobId=job_id)
         status = job.get("StatusCode")
         if status == "InProgress":
             poll_count += 1
-            logging.info("Still waiting... (poll #%d, next check in %d seconds)", poll_count, poll_seconds)
+            logger.info(
+                "Still waiting... (poll #%d, next check in %d seconds)", poll_count, poll_seconds
+            )
             time.sleep(poll_seconds)
             continue
         if status == "Succeeded":
@@ -78,46 +96,115 @@ def wait_for_job(client, vault_name: str, job_id: str, poll_seconds: int) -> Non
         raise RuntimeError(f"Inventory job failed with status: {status}")
 
 
-def fetch_inventory(client, vault_name: str, job_id: str) -> Dict:
-    logging.info("Downloading inventory for vault %s...", vault_name)
+def iter_archive_ids(stream: BinaryIO) -> Iterator[str]:
+    """Stream each ``ArchiveList[].ArchiveId`` from an inventory JSON document."""
+    return ijson.items(stream, "ArchiveList.item.ArchiveId")
+
+
+def fetch_and_optionally_save(
+    client, vault_name: str, job_id: str, save_path: Optional[str] = None
+) -> List[str]:
+    """Return the job's archive IDs, first writing the raw inventory to ``save_path`` if set."""
+    logger.info("Downloading inventory for vault %s...", vault_name)
     output = client.get_job_output(vaultName=vault_name, jobId=job_id)
-    body = output["body"].read()
-    return json.loads(body)
+    body = output["body"]
+    if not save_path:
+        return list(iter_archive_ids(body))
+    # The body can only be read once, so land it on disk and parse from there.
+    save_inventory_to_file(body, save_path)
+    with open(save_path, "rb") as f:
+        return list(iter_archive_ids(f))
 
 
-def save_inventory_to_file(inventory: Dict, file_path: str) -> None:
-    logging.info("Saving inventory to %s...", file_path)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(inventory, f, indent=2)
-    logging.info("Inventory saved successfully.")
+def save_inventory_to_file(body: BinaryIO, file_path: str) -> None:
+    logger.info("Saving inventory to %s...", file_path)
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(body, f)
+    logger.info("Inventory saved successfully.")
 
 
-def load_inventory_from_file(file_path: str) -> Dict:
-    logging.info("Loading inventory from %s...", file_path)
-    with open(file_path, encoding="utf-8") as f:
-        inventory = json.load(f)
-    logging.info("Inventory loaded successfully.")
-    return inventory
+def load_inventory_from_file(file_path: str) -> List[str]:
+    """Return the archive IDs listed in a saved inventory file."""
+    logger.info("Loading inventory from %s...", file_path)
+    # Parse straight from the mapped file rather than copying it into a bytes object first.
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Inventory file {file_path} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            inventory = orjson.loads(view)
+    logger.info("Inventory loaded successfully.")
+    # Skip entries without an ArchiveId, matching the streaming path in iter_archive_ids.
+    return [
+        archive["ArchiveId"]
+        for archive in inventory.get("ArchiveList", [])
+        if "ArchiveId" in archive
+    ]
 
 
-def delete_archives(client, vault_name: str, archives: List[Dict], dry_run: bool) -> int:
-    total = len(archives)
-    logging.info("Found %d archives to delete", total)
+def delete_archives(
+    client, vault_name: str, archive_ids: List[str], dry_run: bool, parallelism: int = 32
+) -> int:
+    total = len(archive_ids)
+    logger.info("Found %d archives to delete", total)
     if dry_run:
-        logging.info("Dry-run enabled; no archives will be deleted.")
-    deleted = 0
-    for index, archive in enumerate(archives, start=1):
-        archive_id = archive.get("ArchiveId")
+        logger.info("Dry-run enabled; no archives will be deleted.")
+        for index, archive_id in enumerate(archive_ids, start=1):
+            logger.info("Would delete %s (%d/%d)", archive_id, index, total)
+        return 0
+
+    log_each = logger.isEnabledFor(logging.DEBUG)
+    delete_archive = client.delete_archive
+
+    def delete_one(archive_id: str, index: int) -> bool:
         try:
-            if dry_run:
-                logging.info("Would delete %s (%d/%d)", archive_id, index, total)
-                continue
+            delete_archive(vaultName=vault_name, archiveId=archive_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Failed to delete %s: %s", archive_id, exc)
+            return False
+        if log_each:
+            logger.debug("Deleted %s (%d/%d)", archive_id, index, total)
+        return True
 
-            client.delete_archive(vaultName=vault_name, archiveId=archive_id)
-            deleted += 1
-            logging.info("Deleted %s (%d/%d)", archive_id, index, total)
+    progress_every = max(1, total // 1000)
+    deleted = 0
+    processed = 0
+
+    def record(done) -> None:
+        nonlocal deleted, processed
+        for future in done:
+            deleted += future.result()
+            processed += 1
+            if processed % progress_every == 0:
+                logger.info("Progress: %d/%d processed, %d deleted", processed, total, deleted)
+
+    # Best-effort warm-up to open a pooled connection before the workers start; the
+    # deletes don't depend on it (the role may lack glacier:DescribeVault).
+    if archive_ids:
+        try:
+            client.describe_vault(vaultName=vault_name)
         except Exception as exc:  # noqa: BLE001
-            logging.error("Failed to delete %s: %s", archive_id, exc)
+            logger.debug("Connection warm-up failed: %s", exc)
+
+    # Not a ``with`` block: on interrupt, queued deletes must be cancelled, not drained.
+    executor = ThreadPoolExecutor(max_workers=parallelism)
+    pending = set()
+    try:
+        # Bound the in-flight futures rather than queueing one per archive up front.
+        for index, archive_id in enumerate(archive_ids, start=1):
+            pending.add(executor.submit(delete_one, archive_id, index))
+            if len(pending) >= parallelism * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                record(done)
+        done, pending = wait(pending)
+        record(done)
+    except BaseException:
+        executor.shutdown(wait=True, cancel_futures=True)
+        record(future for future in pending if future.done() and not future.cancelled())
+        logger.warning("Stopped after deleting %d of %d archives.", deleted, total)
+        raise
+    executor.shutdown()
+    if processed % progress_every:
+        logger.info("Progress: %d/%d processed, %d deleted", processed, total, deleted)
     return deleted
 
 
@@ -126,44 +213,52 @@ def main() -> int:
     logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
 
     session = boto3.session.Session(region_name=args.region)
-    client = session.client("glacier")
+    # Pool sized to workers; validation off for the delete hot path.
+    client = session.client(
+        "glacier",
+        config=Config(
+            max_pool_connections=max(args.parallelism, 64),
+            tcp_keepalive=True,
+            retries={"mode": "adaptive", "total_max_attempts": 10},
+            parameter_validation=False,
+        ),
+    )
 
     try:
         if args.dry_run:
-            logging.info("Dry-run mode: no archives will be deleted.")
+            logger.info("Dry-run mode: no archives will be deleted.")
         
         # Load or retrieve inventory
         if args.load_inventory:
-            inventory = load_inventory_from_file(args.load_inventory)
-        elif args.use_job_id:
-            logging.info("Using existing inventory-retrieval job: %s", args.use_job_id)
-            wait_for_job(client, args.vault_name, args.use_job_id, poll_seconds=args.poll_seconds)
-            inventory = fetch_inventory(client, args.vault_name, args.use_job_id)
-            
-            # Save inventory if requested
-            if args.save_inventory:
-                save_inventory_to_file(inventory, args.save_inventory)
+            archive_ids = load_inventory_from_file(args.load_inventory)
         else:
-            job_id = start_inventory_job(client, args.vault_name)
-            logging.info("Started inventory-retrieval job: %s", job_id)
+            if args.use_job_id:
+                job_id = args.use_job_id
+                logger.info("Using existing inventory-retrieval job: %s", job_id)
+            else:
+                job_id = start_inventory_job(client, args.vault_name)
+                logger.info("Started inventory-retrieval job: %s", job_id)
             wait_for_job(client, args.vault_name, job_id, poll_seconds=args.poll_seconds)
-            inventory = fetch_inventory(client, args.vault_name, job_id)
-            
-            # Save inventory if requested
-            if args.save_inventory:
-                save_inventory_to_file(inventory, args.save_inventory)
-        
-        archives = inventory.get("ArchiveList", [])
-        deleted = delete_archives(client, args.vault_name, archives, dry_run=args.dry_run)
+            archive_ids = fetch_and_optionally_save(
+                client, args.vault_name, job_id, save_path=args.save_inventory
+            )
+
+        deleted = delete_archives(
+            client,
+            args.vault_name,
+            archive_ids,
+            dry_run=args.dry_run,
+            parallelism=args.parallelism,
+        )
         if args.dry_run:
-            logging.info("Dry-run complete. Would delete %d archives.", len(archives))
+            logger.info("Dry-run complete. Would delete %d archives.", len(archive_ids))
         else:
-            logging.info("Finished. Deleted %d of %d archives.", deleted, len(archives))
+            logger.info("Finished. Deleted %d of %d archives.", deleted, len(archive_ids))
     except KeyboardInterrupt:
-        logging.warning("Interrupted by user; exiting.")
+        logger.warning("Interrupted by user; exiting.")
         return 1
     except Exception as exc:  # noqa: BLE001
-        logging.error("Error: %s", exc)
+        logger.error("Error: %s", exc)
         return 1
 
     return 0